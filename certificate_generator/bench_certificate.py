@@ -0,0 +1,257 @@
+"""Offline performance benchmarks for generate_certificate().
+
+The celebration icon is served from a local HTTP stand-in, so no network is
+needed. Measures single-certificate latency, throughput at several levels of
+parallelism (threads and processes), PDF size, and peak RSS and RSS growth
+over a batch of certificates, and writes the results as JSON. Pass --compare with an earlier
+results file to fail on regressions.
+
+    python bench_certificate.py --output bench.json
+    python bench_certificate.py --compare bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import project
+
+# Metrics where a larger value is better; every other metric is "lower is better"
+HIGHER_IS_BETTER = ("throughput",)
+
+# Absolute slack, in the metric's own units, allowed on top of the relative
+# tolerance. Memory growth is near zero when nothing leaks, so a relative
+# tolerance alone would either skip it or flag allocator noise.
+ABSOLUTE_SLACK = {"rss_growth_mb": 5.0, "peak_rss_mb": 5.0}
+
+# --- Local Icon Stand-in ---
+
+# Byte size the generated stand-in aims for: a detailed 512x512 RGBA icon
+# PNG, so decoding and embedding it costs about what the real icon does
+ICON_TARGET_BYTES = 35_000
+
+def make_icon(target_bytes=ICON_TARGET_BYTES):
+    """Returns a deterministic 512x512 RGBA PNG of roughly target_bytes.
+
+    A flat colour compresses to a couple of kilobytes and makes PNG decoding
+    nearly free, so the stand-in is a round, anti-aliased gradient "cookie"
+    with seeded speckles, adding speckles until the PNG reaches the target.
+    """
+    import numpy as np
+    from PIL import Image
+
+    y, x = np.mgrid[0:512, 0:512] / 511.0
+    radius = np.hypot(x - 0.5, y - 0.5)
+    base = np.stack([200 + 40 * x, 120 + 60 * y, 50 + 40 * (1 - radius)], axis=-1)
+    alpha = np.clip((0.48 - radius) * 512, 0, 1) * 255
+    rng = np.random.default_rng(0)
+    noise = 12 * rng.standard_normal((512, 512, 3))
+    spots = rng.random((512, 512, 1))
+
+    png = b""
+    for density in (0, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1):
+        rgb = np.clip(base + noise * (spots < density), 0, 255)
+        buffer = BytesIO()
+        Image.fromarray(np.dstack([rgb, alpha]).astype(np.uint8), "RGBA").save(buffer, format="PNG")
+        png = buffer.getvalue()
+        if len(png) >= target_bytes:
+            break
+    return png
+
+def serve_icon(icon):
+    """Serves icon at http://127.0.0.1:<port>/icon.png on a daemon thread. Returns the server."""
+
+    class IconHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(icon)))
+            self.end_headers()
+            self.wfile.write(icon)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), IconHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def use_icon_url(url):
+    """Points generate_certificate at the stand-in; also the process pool initializer."""
+    project.IMAGE_URL = url
+
+# --- Measurements ---
+
+def render(index):
+    """Renders one certificate into the current directory and returns its size in bytes."""
+    filename = project.generate_certificate(f"Bench {index}", 12)
+    size = os.path.getsize(filename)
+    os.remove(filename)
+    return size
+
+def measure_latency(runs):
+    times = []
+    for index in range(runs):
+        start = time.perf_counter()
+        render(index)
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return {
+        "latency_ms_median": statistics.median(times),
+        "latency_ms_p95": times[min(len(times) - 1, int(len(times) * 0.95))],
+    }
+
+def measure_throughput(count, levels, url):
+    results = {}
+    for workers in levels:
+        for kind, pool in (
+            ("threads", ThreadPoolExecutor(max_workers=workers)),
+            ("processes", ProcessPoolExecutor(max_workers=workers, initializer=use_icon_url, initargs=(url,))),
+        ):
+            with pool:
+                # Warm up every worker (imports, first connection) before timing
+                list(pool.map(render, range(workers)))
+                start = time.perf_counter()
+                list(pool.map(render, range(count)))
+                elapsed = time.perf_counter() - start
+            results[f"throughput_{kind}_{workers}_per_s"] = count / elapsed
+    return results
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def current_rss_mb():
+    """Current resident set size; falls back to the peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except OSError:
+        return peak_rss_mb()
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+def measure_memory(count, url):
+    """Runs the memory batch in a fresh interpreter so earlier phases cannot mask its growth.
+
+    The child renders into the current (temporary) directory and reports its
+    peak RSS and how much its current RSS grew over the batch.
+    """
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--memory-child", str(count), "--icon-url", url],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout)
+
+def memory_child(count, url):
+    use_icon_url(url)
+    # Warm up (imports, fonts, first connection) before taking the baseline
+    for index in range(min(100, max(1, count // 10))):
+        render(index)
+    before = current_rss_mb()
+    for index in range(count):
+        render(index)
+    after = current_rss_mb()
+    print(json.dumps({"peak_rss_mb": peak_rss_mb(), "rss_growth_mb": after - before}))
+
+# --- Recording and Comparing Results ---
+
+def compare(results, baseline, tolerance):
+    """Returns a list of regression messages for metrics worse than baseline by more than tolerance."""
+    regressions = []
+    for metric, old in baseline["metrics"].items():
+        new = results["metrics"].get(metric)
+        if new is None:
+            continue
+        worse = old - new if metric.startswith(HIGHER_IS_BETTER) else new - old
+        allowed = max(abs(old) * tolerance, ABSOLUTE_SLACK.get(metric, 0.0))
+        if worse > allowed:
+            regressions.append(f"{metric}: {old:.2f} -> {new:.2f} ({worse:+.2f} worse, {allowed:.2f} allowed)")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark certificate generation offline.")
+    parser.add_argument("--runs", type=int, default=50, help="certificates for the latency measurement")
+    parser.add_argument("--count", type=int, default=200, help="certificates per throughput level")
+    parser.add_argument("--memory-count", type=int, default=2000, help="certificates for the memory measurement")
+    parser.add_argument("--parallelism", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results from an earlier run to check for regressions")
+    parser.add_argument("--icon", help="PNG to serve instead of the generated stand-in (e.g. a saved copy of the real icon)")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed fractional slowdown (default: 0.2)")
+    # Internal: the memory phase re-runs this script in a fresh process
+    parser.add_argument("--memory-child", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--icon-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.memory_child is not None:
+        memory_child(args.memory_child, args.icon_url)
+        return
+
+    if args.icon:
+        with open(args.icon, "rb") as f:
+            icon = f.read()
+    else:
+        icon = make_icon()
+    server = serve_icon(icon)
+    url = f"http://127.0.0.1:{server.server_port}/icon.png"
+    use_icon_url(url)
+
+    metrics = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        # Certificates are written to the working directory, so keep them out of the repo
+        os.chdir(workdir)
+        try:
+            metrics["pdf_bytes"] = render(0)
+            metrics.update(measure_latency(args.runs))
+            metrics.update(measure_throughput(args.count, args.parallelism, url))
+            metrics.update(measure_memory(args.memory_count, url))
+        finally:
+            os.chdir(cwd)
+    server.shutdown()
+
+    from fpdf import __version__ as fpdf_version
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "fpdf2": fpdf_version,
+            "runs": args.runs,
+            "count": args.count,
+            "memory_count": args.memory_count,
+            "icon": args.icon or "generated",
+            "icon_bytes": len(icon),
+        },
+        "metrics": metrics,
+    }
+
+    for metric, value in metrics.items():
+        print(f"{metric:32} {value:12.2f}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if baseline["meta"].get("icon_bytes") != len(icon):
+            print(f"NOTE baseline used a {baseline['meta'].get('icon_bytes')}-byte icon, this run {len(icon)} bytes")
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
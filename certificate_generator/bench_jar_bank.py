@@ -0,0 +1,93 @@
+"""Timing benchmark for JarBank against a plain loop of Jar calls.
+
+Runs skewed workloads (one very hot jar, and a Zipf-distributed leaderboard)
+through JarBank.apply and through Jar.deposit/withdraw one op at a time, and
+reports both times. Exits with an error if JarBank is slower than the loop
+on any workload.
+
+    python bench_jar_bank.py --output jar_bank.json
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from jar_bank import JarBank
+from project import Jar
+
+# --- Workloads ---
+
+def hot_jar(rng, n):
+    """Half the ops hit jar 0, which keeps rejecting; a quarter hit jar 999, which never does."""
+    capacities = np.append(rng.integers(0, 20, size=999), 10**6)
+    jars = np.where(rng.random(n) < 0.5, 0, rng.integers(0, 1000, size=n))
+    jars[rng.random(n) < 0.25] = 999
+    deltas = rng.integers(-5, 6, size=n)
+    deltas[jars == 999] = np.abs(deltas[jars == 999]) + 1
+    return capacities, jars, deltas
+
+def zipf(rng, n):
+    """Leaderboard-style traffic: jar popularity follows a Zipf distribution."""
+    capacities = np.full(100_000, 100)
+    jars = np.minimum(rng.zipf(1.3, size=n) - 1, len(capacities) - 1)
+    deltas = rng.integers(-3, 4, size=n)
+    return capacities, jars, deltas
+
+WORKLOADS = {"hot_jar": hot_jar, "zipf": zipf}
+
+# --- Measurements ---
+
+def time_bank(capacities, jars, deltas):
+    # Warm up once so the timing does not include first-call overhead
+    JarBank(capacities).apply(jars[:1000], deltas[:1000])
+    bank = JarBank(capacities)
+    start = time.perf_counter()
+    bank.apply(jars, deltas)
+    return time.perf_counter() - start
+
+def time_jars(capacities, jars, deltas):
+    reference = [Jar(capacity=int(c)) for c in capacities]
+    start = time.perf_counter()
+    for j, d in zip(jars.tolist(), deltas.tolist()):
+        try:
+            if d >= 0:
+                reference[j].deposit(d)
+            else:
+                reference[j].withdraw(-d)
+        except ValueError:
+            pass
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JarBank against a loop of Jar calls.")
+    parser.add_argument("--ops", type=int, default=1_000_000, help="ops per workload")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    metrics = {}
+    slower = []
+    for name, workload in WORKLOADS.items():
+        capacities, jars, deltas = workload(rng, args.ops)
+        bank_time = time_bank(capacities, jars, deltas)
+        jar_time = time_jars(capacities, jars, deltas)
+        metrics[f"{name}_bank_s"] = bank_time
+        metrics[f"{name}_jar_loop_s"] = jar_time
+        if bank_time >= jar_time:
+            slower.append(name)
+
+    for metric, value in metrics.items():
+        print(f"{metric:24} {value:10.3f}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"meta": {"ops": args.ops}, "metrics": metrics}, f, indent=2)
+
+    for name in slower:
+        print(f"REGRESSION {name}: JarBank is slower than a loop of Jar calls")
+    if slower:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
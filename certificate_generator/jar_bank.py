@@ -0,0 +1,166 @@
+import numpy as np
+
+# Runs of at least this many ops on one jar that cannot take the prefix-sum
+# fast path are finished sequentially instead of one vectorized pass per op
+LONG_RUN = 256
+
+# --- JarBank Class ---
+
+class JarBank:
+    """Many cookie jars stored as NumPy arrays, updated in vectorized batches.
+
+    Each jar follows the same rules as project.Jar, but a batch never raises
+    for a bad operation: ops with a non-positive amount, or that would overflow
+    or underflow their jar, are reported in the returned ``rejected`` mask and
+    leave that jar untouched. ``filled`` holds the indices of jars that an
+    accepted deposit in the batch brought to capacity.
+    """
+
+    def __init__(self, capacities):
+        capacities = np.asarray(capacities)
+        if capacities.ndim != 1 or (capacities.size and capacities.dtype.kind not in "iu"):
+            raise ValueError("Capacities must be a 1-D array of integers")
+        if (capacities < 0).any():
+            raise ValueError("Capacity must be a non-negative integer")
+        self._capacity = capacities.astype(np.int64)
+        self._size = np.zeros(len(capacities), dtype=np.int64)
+
+    def __len__(self):
+        return len(self._size)
+
+    @property
+    def capacity(self):
+        view = self._capacity.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def size(self):
+        view = self._size.view()
+        view.flags.writeable = False
+        return view
+
+    def check_deposit(self, jars, amounts):
+        """Vectorized check_deposit: True where each deposit would fit, without modifying state."""
+        jars, amounts, valid = self._prepare(jars, amounts)
+        return valid & (amounts > 0) & (self._size[jars] + amounts <= self._capacity[jars])
+
+    def deposit(self, jars, amounts):
+        """Deposits amounts[i] into jars[i], in order. Returns (rejected, filled)."""
+        jars, amounts, valid = self._prepare(jars, amounts)
+        return self._apply(jars, amounts, valid & (amounts > 0))
+
+    def withdraw(self, jars, amounts):
+        """Withdraws amounts[i] from jars[i], in order. Returns (rejected, filled).
+
+        A withdrawal never fills a jar, so ``filled`` is always empty here.
+        """
+        jars, amounts, valid = self._prepare(jars, amounts)
+        return self._apply(jars, -amounts, valid & (amounts > 0))
+
+    def apply(self, jars, deltas):
+        """Applies a mixed stream: positive deltas deposit, negative deltas withdraw.
+
+        A zero delta is rejected, like a zero deposit or withdrawal on a Jar.
+        Returns (rejected, filled).
+        """
+        jars, deltas, valid = self._prepare(jars, deltas)
+        return self._apply(jars, deltas, valid & (deltas != 0))
+
+    def _prepare(self, jars, amounts):
+        jars = np.asarray(jars)
+        amounts = np.asarray(amounts)
+        if jars.ndim != 1 or amounts.shape != jars.shape:
+            raise ValueError("Jars and amounts must be 1-D arrays of the same length")
+        if jars.size and jars.dtype.kind not in "iu":
+            raise ValueError("Jar indices must be integers")
+        jars = jars.astype(np.intp)
+        if jars.size and (jars.min() < 0 or jars.max() >= len(self)):
+            raise ValueError("Jar index out of range")
+
+        # Jar only accepts ints, so a non-integer batch rejects every op
+        if amounts.dtype.kind in "iu":
+            return jars, amounts.astype(np.int64), np.ones(len(jars), dtype=bool)
+        return jars, np.zeros(len(jars), dtype=np.int64), np.zeros(len(jars), dtype=bool)
+
+    def _apply(self, jars, deltas, valid):
+        n = len(jars)
+        if n == 0:
+            return np.ones(0, dtype=bool), np.empty(0, dtype=np.intp)
+
+        # Group the ops by jar, keeping their order within each jar's run
+        order = np.argsort(jars, kind="stable")
+        j = jars[order]
+        d = deltas[order]
+        ok = valid[order]
+        cap = self._capacity[j]
+        positions = np.arange(n)
+        starts = np.ones(n, dtype=bool)
+        starts[1:] = j[1:] != j[:-1]
+        run_first = np.flatnonzero(starts)
+        run_end = np.append(run_first[1:], n)
+        run_id = np.cumsum(starts) - 1
+        rank = positions - run_first[run_id]
+
+        # Size of each jar after each op, assuming every earlier op in its run
+        # is accepted. Up to a run's first bad op this is exact.
+        cum = np.concatenate(([0], np.cumsum(np.where(ok, d, 0))))
+        path = self._size[j] + cum[1:] - cum[run_first][run_id]
+        bad = ~ok | (path < 0) | (path > cap)
+        run_bad = np.add.reduceat(bad, run_first) > 0
+
+        rejected = np.ones(n, dtype=bool)
+        filled = np.zeros(n, dtype=bool)
+
+        # Fast path: runs with no rejected op are applied in one step
+        clean = ~run_bad[run_id]
+        rejected[clean] = False
+        filled[clean] = (d[clean] > 0) & (path[clean] == cap[clean])
+        clean_runs = ~run_bad
+        self._size[j[run_first[clean_runs]]] = path[run_end[clean_runs] - 1]
+
+        # Short runs with a rejection: all ops of one rank touch distinct jars,
+        # so each rank is applied as a single vectorized step
+        short = run_bad & (run_end - run_first < LONG_RUN)
+        ops = np.flatnonzero(short[run_id])
+        ops = ops[np.argsort(rank[ops], kind="stable")]
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(rank[ops]))))
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            step = ops[lo:hi]
+            new_size = self._size[j[step]] + d[step]
+            good = ok[step] & (new_size >= 0) & (new_size <= cap[step])
+            self._size[j[step][good]] = new_size[good]
+            rejected[step] = ~good
+            filled[step] = good & (d[step] > 0) & (new_size == cap[step])
+
+        # Long runs with a rejection: accept everything before the first bad
+        # op at once, then finish the run sequentially
+        for run in np.flatnonzero(run_bad & ~short):
+            lo, hi = run_first[run], run_end[run]
+            first_bad = lo + int(np.argmax(bad[lo:hi]))
+            rejected[lo:first_bad] = False
+            filled[lo:first_bad] = (d[lo:first_bad] > 0) & (path[lo:first_bad] == cap[lo:first_bad])
+            size = path[first_bad - 1] if first_bad > lo else self._size[j[lo]]
+            self._apply_run(j[lo], int(size), d, ok, rejected, filled, first_bad, hi)
+
+        unsorted_rejected = np.empty(n, dtype=bool)
+        unsorted_rejected[order] = rejected
+        return unsorted_rejected, np.unique(j[filled])
+
+    def _apply_run(self, jar, size, deltas, valid, rejected, filled, lo, hi):
+        """Applies ops lo..hi-1 (all on one jar, starting at size) one at a time, in order."""
+        capacity = int(self._capacity[jar])
+        run_rejected = []
+        run_filled = []
+        for i, (delta, ok) in enumerate(zip(deltas[lo:hi].tolist(), valid[lo:hi].tolist()), lo):
+            new_size = size + delta
+            if ok and 0 <= new_size <= capacity:
+                size = new_size
+                if size == capacity and delta > 0:
+                    run_filled.append(i)
+            else:
+                run_rejected.append(i)
+        rejected[lo:hi] = False
+        rejected[run_rejected] = True
+        filled[run_filled] = True
+        self._size[jar] = size
@@ -0,0 +1,269 @@
+import copy
+import json
+import os
+import time
+from collections import namedtuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from project import Jar
+
+# Read-only view of a stored jar; change jars through JarStore so every change is logged
+JarState = namedtuple("JarState", ["name", "capacity", "size"])
+
+# --- JarStore Class ---
+
+class JarStore:
+    """Many named jars kept in one crash-safe, append-only ledger file.
+
+    The file is a JSON-lines log. Its first line is a snapshot of every jar
+    ({"snapshot": {name: [capacity, size]}}) and each following line is one
+    event: ["C", name, capacity], ["D", name, n] or ["W", name, n].
+
+    An event is written before the jar changes in memory, and each event is
+    handed to the OS as soon as it is logged, so it survives the process
+    dying. fsync, which makes it survive a machine crash, is batched to every
+    sync_every events or sync_interval seconds, whichever comes first; an
+    idle service can call flush(). After snapshot_every events the file is
+    compacted into a fresh snapshot, so loading replays at most
+    snapshot_every events however long the history is.
+
+    Jars are held in a dict, so looking one up by name is O(1). Only one
+    JarStore may have a ledger open at a time; a second one, in this or
+    another process, raises RuntimeError.
+    """
+
+    def __init__(self, path, sync_every=64, sync_interval=1.0, snapshot_every=10_000):
+        if not isinstance(sync_every, int) or sync_every <= 0:
+            raise ValueError("Sync batch size must be a positive integer")
+        if not isinstance(sync_interval, (int, float)) or sync_interval <= 0:
+            raise ValueError("Sync interval must be a positive number of seconds")
+        if not isinstance(snapshot_every, int) or snapshot_every <= 0:
+            raise ValueError("Snapshot interval must be a positive integer")
+        self._path = path
+        self._sync_every = sync_every
+        self._sync_interval = sync_interval
+        self._last_sync = time.monotonic()
+        self._snapshot_every = snapshot_every
+        self._jars = {}
+        self._unsynced = 0
+        self._events = 0
+        self._file = None
+        # Size of the ledger up to the last fully written event
+        self._offset = 0
+        self._failed = False
+
+        # Lock before reading, so a second store cannot truncate a live ledger
+        self._lock = self._acquire_lock(f"{path}.lock")
+        try:
+            if os.path.exists(path):
+                self._load()
+                self._file = open(path, "ab", buffering=0)
+            else:
+                self.compact()
+        except BaseException:
+            self._release_lock()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __contains__(self, name):
+        return name in self._jars
+
+    def __len__(self):
+        return len(self._jars)
+
+    @property
+    def names(self):
+        return list(self._jars)
+
+    def get(self, name):
+        """Returns a read-only JarState for name. Raises KeyError if there is none."""
+        jar = self._jars[name]
+        return JarState(name, jar.capacity, jar.size)
+
+    def create(self, name, capacity=12):
+        # Snapshot keys are JSON object keys, so only string names reload unchanged
+        if not isinstance(name, str):
+            raise ValueError("Jar name must be a string")
+        if name in self._jars:
+            raise ValueError(f"Jar {name!r} already exists")
+        jar = self._make_jar(name, capacity)
+        self._commit(["C", name, capacity], jar)
+        return self.get(name)
+
+    def deposit(self, name, n):
+        # Validate on a copy; the stored jar only changes once the event is written
+        jar = copy.copy(self._jars[name])
+        jar.deposit(n)
+        self._commit(["D", name, n], jar)
+
+    def withdraw(self, name, n):
+        jar = copy.copy(self._jars[name])
+        jar.withdraw(n)
+        self._commit(["W", name, n], jar)
+
+    def flush(self):
+        """Fsyncs logged events to disk."""
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def compact(self):
+        """Atomically replaces the ledger with a snapshot of the current jars."""
+        self._check_usable()
+        snapshot = {name: [jar.capacity, jar.size] for name, jar in self._jars.items()}
+        line = json.dumps({"snapshot": snapshot}).encode() + b"\n"
+        tmp_path = f"{self._path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Unsynced events are already part of the snapshot, so the old file can go
+        os.replace(tmp_path, self._path)
+        try:
+            if self._file is not None:
+                self._file.close()
+            self._sync_directory()
+            self._file = open(self._path, "ab", buffering=0)
+        except OSError:
+            self._failed = True
+            raise
+        self._offset = len(line)
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._events = 0
+
+    def close(self):
+        try:
+            if self._file is not None and not self._file.closed:
+                if not self._failed:
+                    self.flush()
+                self._file.close()
+        finally:
+            self._release_lock()
+
+    def _make_jar(self, name, capacity, size=0):
+        jar = Jar(capacity=capacity)
+        if size:
+            jar.deposit(size)
+        jar.name = name
+        return jar
+
+    def _commit(self, event, jar):
+        """Writes event to the ledger, then makes jar the stored state."""
+        self._check_usable()
+        data = json.dumps(event).encode() + b"\n"
+        try:
+            # The file is unbuffered, so the event reaches the OS before we return
+            remaining = data
+            while remaining:
+                remaining = remaining[self._file.write(remaining):]
+        except OSError:
+            # Cut off the partial line so later events do not land after it
+            self._rollback()
+            raise
+        self._offset += len(data)
+        self._jars[jar.name] = jar
+
+        self._events += 1
+        self._unsynced += 1
+        if self._events >= self._snapshot_every:
+            self.compact()
+        elif self._unsynced >= self._sync_every or time.monotonic() - self._last_sync >= self._sync_interval:
+            self.flush()
+
+    def _rollback(self):
+        try:
+            os.ftruncate(self._file.fileno(), self._offset)
+        except OSError:
+            self._failed = True
+
+    def _check_usable(self):
+        if self._failed:
+            raise RuntimeError(f"Ledger {self._path} could not be repaired after a failed write; reopen the store")
+
+    def _load(self):
+        with open(self._path, "rb") as f:
+            data = f.read()
+
+        lines = data.splitlines(keepends=True)
+        good = 0
+        for number, line in enumerate(lines, 1):
+            last = number == len(lines)
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("Unterminated line")
+                record = json.loads(line)
+            except ValueError:
+                # A crash mid-write can only tear the last line; anything earlier is corruption
+                if last:
+                    break
+                raise ValueError(f"Corrupt ledger {self._path}: line {number} is not a valid record")
+            if isinstance(record, dict):
+                for name, (capacity, size) in record["snapshot"].items():
+                    self._jars[name] = self._make_jar(name, capacity, size)
+            else:
+                self._replay(record)
+                self._events += 1
+            good += len(line)
+
+        if good < len(data):
+            with open(self._path, "r+b") as f:
+                f.truncate(good)
+                os.fsync(f.fileno())
+        self._offset = good
+
+    def _replay(self, event):
+        action, name, amount = event
+        if action == "C":
+            self._jars[name] = self._make_jar(name, amount)
+        elif action == "D":
+            self._jars[name].deposit(amount)
+        elif action == "W":
+            self._jars[name].withdraw(amount)
+        else:
+            raise ValueError(f"Unknown ledger event {action!r}")
+
+    def _acquire_lock(self, lock_path):
+        # The ledger itself is replaced on compaction, so lock a sibling file instead
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            raise RuntimeError(f"Ledger {self._path} is already open in another JarStore")
+        return fd
+
+    def _release_lock(self):
+        if self._lock is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._lock, fcntl.LOCK_UN)
+        else:
+            msvcrt.locking(self._lock, msvcrt.LK_UNLCK, 1)
+        os.close(self._lock)
+        self._lock = None
+
+    def _sync_directory(self):
+        # Make the rename itself durable; not every platform can open a directory
+        try:
+            fd = os.open(os.path.dirname(os.path.abspath(self._path)), os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
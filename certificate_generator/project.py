@@ -1,9 +1,39 @@
 import sys
 import os
-import requests
+import contextlib
+import queue
+import threading
+import importlib
 from io import BytesIO
-# Using the fpdf2 library as specified in the project README
-from fpdf import FPDF
+
+# --- Lazy Imports ---
+
+# requests and fpdf2 are only needed to render a certificate, so they are
+# imported on first use instead of on every start of the CLI or the tests.
+# They still appear as module attributes (project.requests, project.FPDF),
+# so tests can patch them as before.
+_LAZY_IMPORTS = {
+    "requests": ("requests", None),
+    # Using the fpdf2 library as specified in the project README
+    "FPDF": ("fpdf", "FPDF"),
+}
+
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_IMPORTS[name]
+    value = importlib.import_module(module_name)
+    if attribute:
+        value = getattr(value, attribute)
+    globals()[name] = value
+    return value
+
+def _lazy(name):
+    """Returns a lazily imported name, honouring anything patched onto the module."""
+    try:
+        return globals()[name]
+    except KeyError:
+        return __getattr__(name)
 
 # --- Jar Class ---
 
@@ -74,8 +104,14 @@ def get_current_status(jar):
 
     return f"Status: {icon} {status}"
 
+# Celebration icon, and seconds to wait for it before giving up on it
+IMAGE_URL = "https://cdn-icons-png.flaticon.com/512/1047/1047711.png"
+IMAGE_TIMEOUT = 10
+
 def generate_certificate(name, cookies):
     """Generates a personalized PDF certificate using fpdf2 and robust image loading."""
+    FPDF = _lazy("FPDF")
+    requests = _lazy("requests")
 
     # 1. Setup PDF
     # Landscape orientation, A4 format
@@ -115,11 +151,9 @@ def generate_certificate(name, cookies):
     pdf.set_text_color(0, 0, 0)
     pdf.cell(w=0, h=10, text=f"Successfully managed and earned a total of {cookies} cookies", border=0, align='C', new_x="LMARGIN", new_y="NEXT")
 
-
-    IMAGE_URL = "https://cdn-icons-png.flaticon.com/512/1047/1047711.png"
-
     try:
-        response = requests.get(IMAGE_URL)
+        # Cap the fetch so a slow CDN cannot stall certificate generation
+        response = requests.get(IMAGE_URL, timeout=IMAGE_TIMEOUT)
         response.raise_for_status() # Check for bad response status
         image_data = BytesIO(response.content)
 
@@ -143,9 +177,194 @@ def generate_certificate(name, cookies):
     pdf.output(filename)
     return filename
 
+def replay(lines, jar, worker=None):
+    """Applies scripted 'D n' / 'W n' / 'Q' commands to the jar without per-step output.
+
+    Stops at the first Q or at the end of the input. Returns a summary dict with
+    the applied/rejected counts, how many times the jar filled, and the
+    certificate files generated. Every fill overwrites <name>_certificate.pdf,
+    so only the latest fill per name is rendered, once the script is done.
+    With a CertificateWorker, that render is submitted to it instead and
+    reported through its callback.
+    """
+    applied = rejected = filled = 0
+    latest_fill = {}
+    deposit = jar.deposit
+    withdraw = jar.withdraw
+
+    for line in lines:
+        parts = line.split()
+        if not parts:
+            continue
+        action = parts[0].upper()
+        if action == 'Q':
+            break
+
+        try:
+            if len(parts) != 2:
+                raise ValueError("Expected an action and an amount")
+            amount = int(parts[1])
+            if action == 'D':
+                deposit(amount)
+            elif action == 'W':
+                withdraw(amount)
+            else:
+                raise ValueError(f"Invalid action {parts[0]!r}")
+        except ValueError:
+            rejected += 1
+            continue
+
+        applied += 1
+        # Same trigger as interactive mode: the deposit filled the jar
+        if action == 'D' and jar.size == jar.capacity:
+            filled += 1
+            latest_fill[jar.name] = jar.size
+
+    certificates = []
+    for name, cookies in latest_fill.items():
+        if worker is not None:
+            worker.submit(name, cookies)
+        else:
+            certificates.append(generate_certificate(name, cookies))
+
+    return {"applied": applied, "rejected": rejected, "filled": filled, "size": jar.size,
+            "capacity": jar.capacity, "certificates": certificates}
+
+# --- Background Certificate Worker ---
+
+def report_certificate(name, filename, error):
+    """Default completion callback: tells the user a background certificate is done."""
+    if error is not None:
+        print(f"\n🛑 Could not generate the certificate for {name}: {error}")
+    else:
+        print("\n🥳 CONGRATULATION YOUR COOKIE CERTIFICATE IS READY")
+        print(f"Certificate saved as {filename}")
+
+class CertificateWorker:
+    """Renders certificates on background threads so the jar loop never waits on a PDF.
+
+    Requests wait in a bounded queue: once max_pending are waiting, submit()
+    blocks until a worker frees a slot, so a burst of fills cannot pile up
+    without limit. on_done(name, filename, error) is called from the worker
+    thread as each certificate finishes.
+    """
+
+    def __init__(self, workers=1, max_pending=8, on_done=report_certificate):
+        if not isinstance(workers, int) or workers <= 0:
+            raise ValueError("Workers must be a positive integer")
+        if not isinstance(max_pending, int) or max_pending <= 0:
+            raise ValueError("Max pending must be a positive integer")
+        self._jobs = queue.Queue(maxsize=max_pending)
+        self._on_done = on_done
+        # Certificates submitted but not yet finished (queued or rendering)
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._stopped = False
+        self._threads = [threading.Thread(target=self._run, daemon=True) for _ in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, name, cookies, timeout=None):
+        """Queues a certificate. Blocks while the queue is full; raises queue.Full after timeout."""
+        if self._stopped:
+            raise RuntimeError("Certificate worker has been drained")
+        with self._lock:
+            self._pending += 1
+        try:
+            self._jobs.put((name, cookies), timeout=timeout)
+        except queue.Full:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+    @property
+    def pending(self):
+        with self._lock:
+            return self._pending
+
+    def drain(self):
+        """Waits for every queued certificate to finish, then stops the worker threads.
+
+        Safe to call more than once; later calls return immediately.
+        """
+        if self._stopped:
+            return
+        self._stopped = True
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+
+            name, cookies = job
+            filename = error = None
+            try:
+                filename = generate_certificate(name, cookies)
+            except Exception as e:
+                error = e
+            try:
+                self._on_done(name, filename, error)
+            except Exception as e:
+                # A failing callback (e.g. emoji on a non-UTF-8 console) must not
+                # kill the worker, or drain() would wait forever on its queue
+                with contextlib.suppress(Exception):
+                    print(f"Warning: certificate callback failed for {name!a}: {e!a}", file=sys.stderr)
+            finally:
+                with self._lock:
+                    self._pending -= 1
+
 # --- Main Interaction Loop ---
 
+def run_script(path, name=None):
+    """Non-interactive mode: replays commands from a file (or stdin for '-') and prints a summary."""
+    jar = Jar(capacity=12)
+    if name:
+        jar.name = name
+
+    certificates = []
+    worker = CertificateWorker(on_done=lambda _, filename, error: certificates.append(filename or error))
+    try:
+        if path == '-':
+            summary = replay(sys.stdin, jar, worker)
+        else:
+            with open(path, encoding='utf-8', buffering=1 << 16) as script:
+                summary = replay(script, jar, worker)
+    except OSError as e:
+        print(f"🛑 Could not read script {path}: {e.strerror or e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        worker.drain()
+
+    summary["certificates"] = sorted({result for result in certificates if not isinstance(result, Exception)})
+    print(f"Applied {summary['applied']} commands, rejected {summary['rejected']}. "
+          f"The jar filled {summary['filled']} time(s).")
+    print(get_current_status(jar))
+    for result in certificates:
+        if isinstance(result, Exception):
+            print(f"🛑 Could not generate a certificate: {result}")
+    for filename in summary["certificates"]:
+        print(f"Certificate saved as {filename}")
+    return summary
+
+USAGE = "Usage: python project.py [SCRIPT [NAME]]  (SCRIPT '-' reads commands from stdin)"
+
 def main():
+    # Scripted mode: python project.py SCRIPT [NAME], with '-' reading from stdin
+    if len(sys.argv) > 1:
+        if sys.argv[1] in ('-h', '--help'):
+            print(USAGE)
+            sys.exit(0)
+        if len(sys.argv) > 3 or (sys.argv[1].startswith('-') and sys.argv[1] != '-'):
+            print(USAGE, file=sys.stderr)
+            sys.exit(2)
+        run_script(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+        return
+
     # Set up the jar, with the 12 capacity you used
     jar = Jar(capacity=12)
 
@@ -155,54 +374,66 @@ def main():
         # Update jar's name property
         jar.name = name
 
-    while True:
-        print("=" * 30)
-        print(get_current_status(jar))
-        print("=" * 30)
-
-        # Main action loop
-        action = input("Action (D: deposit, W: withdraw, Q: quit): ").strip().upper()
-
-        if action == 'Q':
-            print("Thank you for playing!")
-            sys.exit(0)
-
-        elif action == 'D':
-            try:
-                amount = int(input("How many cookies to deposit? "))
-                if not check_deposit(jar, amount):
-                     # Error message reflecting remaining capacity
-                     print(f"🛑 Error: Cannot deposit {amount}. Only {jar.capacity - jar.size} space left.")
-                     continue
-
-                jar.deposit(amount)
-                print(f"✅ Deposited {amount} cookies. Jar now has {jar.size}.")
-
-                # Check for FULL jar condition (which triggers your certificate)
-                if jar.size == jar.capacity:
-                    print("\n🎉 JAR IS FULL! Generating Certificate...")
-                    filename = generate_certificate(jar.name, jar.size)
-                    print("\n🥳 CONGRATULATION YOUR COOKIE CERTIFICATE IS READY")
-                    print(f"Certificate saved as {filename}")
-
-            except ValueError as e:
-                print(f"🛑 Invalid input or operation: {e}")
-            except Exception as e:
-                print(f"🛑 An unexpected error occurred: {e}")
-
-        elif action == 'W':
-            try:
-                amount = int(input("How many cookies to withdraw? "))
-                jar.withdraw(amount)
-                print(f"✅ Withdrew {amount} cookies. Jar now has {jar.size}.")
-
-            except ValueError as e:
-                print(f"🛑 Invalid input or operation: {e}")
-            except Exception as e:
-                print(f"🛑 An unexpected error occurred: {e}")
+    # Certificates render in the background so the prompt stays responsive
+    worker = CertificateWorker()
 
-        else:
-            print("❌ Invalid action. Please enter D, W, or Q.")
+    # Drain on every way out of the loop (Q, end of input, Ctrl-C) so queued
+    # certificates are not cut off mid-render
+    try:
+        while True:
+            print("=" * 30)
+            print(get_current_status(jar))
+            print("=" * 30)
+
+            # Main action loop
+            action = input("Action (D: deposit, W: withdraw, Q: quit): ").strip().upper()
+
+            if action == 'Q':
+                break
+
+            elif action == 'D':
+                try:
+                    amount = int(input("How many cookies to deposit? "))
+                    if not check_deposit(jar, amount):
+                         # Error message reflecting remaining capacity
+                         print(f"🛑 Error: Cannot deposit {amount}. Only {jar.capacity - jar.size} space left.")
+                         continue
+
+                    jar.deposit(amount)
+                    print(f"✅ Deposited {amount} cookies. Jar now has {jar.size}.")
+
+                    # Check for FULL jar condition (which triggers your certificate)
+                    if jar.size == jar.capacity:
+                        print("\n🎉 JAR IS FULL! Generating Certificate...")
+                        worker.submit(jar.name, jar.size)
+
+                except ValueError as e:
+                    print(f"🛑 Invalid input or operation: {e}")
+                except Exception as e:
+                    print(f"🛑 An unexpected error occurred: {e}")
+
+            elif action == 'W':
+                try:
+                    amount = int(input("How many cookies to withdraw? "))
+                    jar.withdraw(amount)
+                    print(f"✅ Withdrew {amount} cookies. Jar now has {jar.size}.")
+
+                except ValueError as e:
+                    print(f"🛑 Invalid input or operation: {e}")
+                except Exception as e:
+                    print(f"🛑 An unexpected error occurred: {e}")
+
+            else:
+                print("❌ Invalid action. Please enter D, W, or Q.")
+    except (EOFError, KeyboardInterrupt):
+        print()
+    finally:
+        if worker.pending:
+            print(f"Waiting for {worker.pending} certificate(s) to finish...")
+        worker.drain()
+
+    print("Thank you for playing!")
+    sys.exit(0)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,102 @@
+import pytest
+import numpy as np
+from project import Jar
+from jar_bank import JarBank
+
+# --- Test 1: batched deposits and the filled indices ---
+def test_deposit():
+    bank = JarBank([5, 3, 4])
+
+    rejected, filled = bank.deposit([0, 1, 2], [2, 3, 5])
+    assert rejected.tolist() == [False, False, True]
+    assert filled.tolist() == [1]
+    assert bank.size.tolist() == [2, 3, 0]
+
+    # Non-positive and non-integer amounts are rejected, not raised
+    rejected, filled = bank.deposit([0, 2], [0, -1])
+    assert rejected.tolist() == [True, True]
+    rejected, filled = bank.deposit([0, 2], [1.0, 2.0])
+    assert rejected.all()
+    assert bank.size.tolist() == [2, 3, 0]
+
+
+# --- Test 2: batched withdrawals ---
+def test_withdraw():
+    bank = JarBank([5, 5])
+    bank.deposit([0, 1], [3, 1])
+
+    rejected, filled = bank.withdraw([0, 1], [2, 2])
+    assert rejected.tolist() == [False, True]
+    assert len(filled) == 0
+    assert bank.size.tolist() == [1, 1]
+
+
+def run_jars(capacities, jars, deltas):
+    """Reference: applies the ops one at a time to plain Jar objects."""
+    reference = [Jar(capacity=int(c)) for c in capacities]
+    expected_rejected = []
+    expected_filled = set()
+    for j, d in zip(jars.tolist(), deltas.tolist()):
+        try:
+            if d >= 0:
+                reference[j].deposit(d)
+                if reference[j].size == reference[j].capacity:
+                    expected_filled.add(j)
+            else:
+                reference[j].withdraw(-d)
+            expected_rejected.append(False)
+        except ValueError:
+            expected_rejected.append(True)
+    return expected_rejected, sorted(expected_filled), [jar.size for jar in reference]
+
+
+# --- Test 3: repeated jars in a batch apply in order, like a Jar would ---
+def test_matches_jar_semantics():
+    rng = np.random.default_rng(0)
+    capacities = rng.integers(0, 10, size=20)
+    jars = rng.integers(0, 20, size=2000)
+    deltas = rng.integers(-6, 7, size=2000)
+
+    bank = JarBank(capacities)
+    rejected, filled = bank.apply(jars, deltas)
+
+    assert (rejected.tolist(), filled.tolist(), bank.size.tolist()) == run_jars(capacities, jars, deltas)
+
+
+# --- Test 3b: a heavily repeated jar stays correct (timing lives in bench_jar_bank.py) ---
+def test_hot_jar():
+    rng = np.random.default_rng(1)
+    n = 100_000
+    capacities = np.append(rng.integers(0, 20, size=999), 10**6)
+    # Half the ops hit jar 0, which keeps rejecting; a quarter hit jar 999, which never does
+    jars = np.where(rng.random(n) < 0.5, 0, rng.integers(0, 1000, size=n))
+    jars[rng.random(n) < 0.25] = 999
+    deltas = rng.integers(-5, 6, size=n)
+    deltas[jars == 999] = np.abs(deltas[jars == 999]) + 1
+
+    bank = JarBank(capacities)
+    rejected, filled = bank.apply(jars, deltas)
+
+    assert (rejected.tolist(), filled.tolist(), bank.size.tolist()) == run_jars(capacities, jars, deltas)
+
+
+# --- Test 4: vectorized check_deposit and argument errors ---
+def test_check_deposit():
+    bank = JarBank([5, 5])
+    bank.deposit([1], [2])
+
+    assert bank.check_deposit([0, 0, 1, 1], [5, 6, 3, 4]).tolist() == [True, False, True, False]
+    assert bank.size.tolist() == [0, 2]
+
+    with pytest.raises(ValueError):
+        JarBank([3, -1])
+    with pytest.raises(ValueError):
+        JarBank([1.5])
+
+    # An empty bank is allowed, like an empty batch
+    empty = JarBank([])
+    assert len(empty) == 0
+    rejected, filled = empty.deposit([], [])
+    assert len(rejected) == 0 and len(filled) == 0
+    with pytest.raises(ValueError):
+        bank.deposit([2], [1])
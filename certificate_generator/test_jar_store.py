@@ -0,0 +1,152 @@
+import errno
+import json
+import pytest
+from jar_store import JarState, JarStore
+
+# --- Test 1: state survives a restart ---
+def test_reload(tmp_path):
+    path = tmp_path / "jars.ledger"
+    with JarStore(path) as store:
+        store.create("alice", capacity=5)
+        store.create("bob")
+        store.deposit("alice", 4)
+        store.withdraw("alice", 1)
+        store.deposit("bob", 12)
+
+        # Invalid operations raise like Jar does and are not logged
+        with pytest.raises(ValueError):
+            store.deposit("alice", 3)
+        with pytest.raises(ValueError):
+            store.create("bob")
+        with pytest.raises(ValueError):
+            store.create(1)
+        with pytest.raises(KeyError):
+            store.deposit("carol", 1)
+
+        # get() hands out read-only state, so changes must go through the store
+        assert store.get("alice") == JarState("alice", 5, 3)
+        assert not hasattr(store.get("alice"), "deposit")
+
+    with JarStore(path) as store:
+        assert store.names == ["alice", "bob"]
+        assert store.get("alice").size == 3
+        assert store.get("alice").capacity == 5
+        assert store.get("bob").size == 12
+        assert store.get("bob").name == "bob"
+
+
+# --- Test 2: a torn last line from a crash is dropped ---
+def test_torn_tail(tmp_path):
+    path = tmp_path / "jars.ledger"
+    with JarStore(path) as store:
+        store.create("alice")
+        store.deposit("alice", 2)
+
+    with open(path, "ab") as f:
+        f.write(b'["D", "ali')
+
+    with JarStore(path) as store:
+        assert store.get("alice").size == 2
+        store.deposit("alice", 1)
+
+    with JarStore(path) as store:
+        assert store.get("alice").size == 3
+
+
+# --- Test 3: compaction keeps the replayed tail bounded ---
+def test_compaction(tmp_path):
+    path = tmp_path / "jars.ledger"
+    with JarStore(path, sync_every=8, snapshot_every=10) as store:
+        store.create("alice", capacity=1)
+        for _ in range(100):
+            store.deposit("alice", 1)
+            store.withdraw("alice", 1)
+        store.deposit("alice", 1)
+
+    # One snapshot line plus fewer than snapshot_every events
+    with open(path, "rb") as f:
+        assert len(f.readlines()) <= 10
+
+    with JarStore(path) as store:
+        assert store.get("alice").size == 1
+
+
+# --- Test 4: logged events reach the OS before any fsync ---
+def test_events_visible_before_sync(tmp_path):
+    path = tmp_path / "jars.ledger"
+    with JarStore(path, sync_every=1000, sync_interval=3600) as store:
+        store.create("alice")
+        store.deposit("alice", 5)
+
+        # Read the file directly while the store is still open and unsynced,
+        # as a restart after the process was killed would
+        with open(path, "rb") as f:
+            events = [json.loads(line) for line in f.readlines()[1:]]
+        assert events == [["C", "alice", 12], ["D", "alice", 5]]
+
+
+# --- Test 5: a failed write leaves neither the file nor the jar half-changed ---
+class FullDisk:
+    """Stands in for the ledger file: writes a few bytes, then fails like a full disk."""
+
+    def __init__(self, file):
+        self._file = file
+
+    def write(self, data):
+        self._file.write(data[:5])
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    def fileno(self):
+        return self._file.fileno()
+
+
+def test_failed_write(tmp_path):
+    path = tmp_path / "jars.ledger"
+    with JarStore(path) as store:
+        store.create("a")
+        store.deposit("a", 1)
+
+        ledger = store._file
+        store._file = FullDisk(ledger)
+        with pytest.raises(OSError):
+            store.deposit("a", 2)
+        assert store.get("a").size == 1
+
+        # Once space is back, later events start on a clean line
+        store._file = ledger
+        store.deposit("a", 5)
+        store.create("b")
+
+    with JarStore(path) as store:
+        assert store.get("a").size == 6
+        assert "b" in store
+
+
+# --- Test 6: corruption before the last line is an error, not a silent cut ---
+def test_corrupt_middle_line(tmp_path):
+    path = tmp_path / "jars.ledger"
+    with JarStore(path) as store:
+        store.create("alice")
+        store.deposit("alice", 2)
+
+    lines = path.read_bytes().splitlines(keepends=True)
+    lines[1] = b'["C", "ali\n'
+    path.write_bytes(b"".join(lines))
+
+    with pytest.raises(ValueError):
+        JarStore(path)
+    # The file is left as it was for inspection
+    assert path.read_bytes() == b"".join(lines)
+
+
+# --- Test 7: only one store may have a ledger open ---
+def test_exclusive_lock(tmp_path):
+    path = tmp_path / "jars.ledger"
+    with JarStore(path) as store:
+        store.create("alice")
+        with pytest.raises(RuntimeError):
+            JarStore(path)
+
+    # Closing releases the lock
+    with JarStore(path) as store:
+        assert "alice" in store
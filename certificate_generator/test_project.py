@@ -1,8 +1,12 @@
 import pytest
+import io
 import os
+import queue
+import threading
+import time
 from unittest.mock import patch
 # IMPORTANT: This line assumes project.py is in the same directory
-from project import Jar, check_deposit, generate_certificate, get_current_status
+from project import Jar, CertificateWorker, check_deposit, generate_certificate, get_current_status, main, replay, run_script
 
 # --- Test 1: check_deposit (Logic fixed: only check, do not modify jar state) ---
 def test_check_deposit():
@@ -60,22 +64,176 @@ def test_get_current_status():
     assert "🟢" in status_full
 
 
-@patch('project.Canvas')
-@patch('os.remove')
-@patch('os.path.exists', return_value=True) # Mock exists to return True for cleanup check
-def test_generate_certificate(mock_exists, mock_remove, MockCanvas):
+# --- Test 3: generate_certificate (fpdf2 and requests patched through the lazy imports) ---
+@patch('project.requests.get')
+@patch('project.FPDF')
+def test_generate_certificate(MockFPDF, mock_get):
     name = "Test User"
     cookies = 10
     expected_filename = "test_user_certificate.pdf"
+    # Serve an empty icon so no network is needed
+    mock_get.return_value.content = b""
 
     # Test 3.1: Function returns the correct filename
     filename = generate_certificate(name, cookies)
     assert filename == expected_filename
 
     # Test 3.2: Verify that the PDF creation was attempted
-    # Check that the Canvas object was initialized and save() was called.
-    MockCanvas.assert_called_once()
-    MockCanvas.return_value.save.assert_called_once()
-
-    # The cleanup logic in the original test is no longer needed here
-    # as we mock the file interaction.
+    # Check that the FPDF object was initialized and output() was called once.
+    MockFPDF.assert_called_once()
+    MockFPDF.return_value.output.assert_called_once_with(expected_filename)
+    mock_get.assert_called_once()
+
+
+# --- Test 4: replay (scripted, non-interactive mode) ---
+@patch('project.generate_certificate', return_value="arezou_certificate.pdf")
+def test_replay(mock_generate):
+    jar = Jar(capacity=5)
+    script = ["D 3\n", "W 1\n", "\n", "D 9\n", "W x\n", "X 1\n", "d 3\n", "Q\n", "D 1\n"]
+
+    summary = replay(script, jar)
+    assert summary["applied"] == 3
+    assert summary["rejected"] == 3
+    assert jar.size == 5
+
+    # The filling deposit triggers exactly one certificate, and Q stops the replay
+    mock_generate.assert_called_once_with("AREZOU", 5)
+    assert summary["certificates"] == ["arezou_certificate.pdf"]
+
+
+@patch('project.generate_certificate', return_value="arezou_certificate.pdf")
+def test_replay_repeated_fills(mock_generate):
+    # Every fill would overwrite the same file, so it is rendered once at the end
+    jar = Jar(capacity=5)
+    summary = replay(["D 5\n", "W 5\n"] * 100, jar)
+    assert summary["filled"] == 100
+    mock_generate.assert_called_once_with("AREZOU", 5)
+
+    # A failing render is not counted as a rejected command
+    mock_generate.side_effect = ValueError("bad font")
+    with pytest.raises(ValueError):
+        replay(["D 5\n"], Jar(capacity=5))
+
+
+
+# --- Test 5: run_script and main() command-line handling ---
+@patch('project.generate_certificate', return_value="bob_certificate.pdf")
+def test_run_script(mock_generate, tmp_path, capsys):
+    script = tmp_path / "commands.txt"
+    script.write_text("D 12\nW 12\nD 12\nW 20\nQ\n")
+
+    # Test 5.1: a successful run prints one summary and each certificate file once
+    summary = run_script(str(script), "Bob")
+    assert summary["applied"] == 3
+    assert summary["rejected"] == 1
+    assert summary["filled"] == 2
+    assert summary["certificates"] == ["bob_certificate.pdf"]
+    mock_generate.assert_called_once_with("Bob", 12)
+
+    output = capsys.readouterr().out
+    assert "Applied 3 commands, rejected 1." in output
+    assert output.count("Certificate saved as bob_certificate.pdf") == 1
+
+
+def test_run_script_missing_file(tmp_path, capsys):
+    # Test 5.2: a missing script is reported in one line with a non-zero exit, not a traceback
+    with pytest.raises(SystemExit) as exit_info:
+        run_script(str(tmp_path / "missing.txt"))
+    assert exit_info.value.code == 1
+    assert "Could not read script" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("argv, code", [
+    (["--help"], 0),
+    (["-h"], 0),
+    (["--bogus"], 2),
+    (["a.txt", "Bob", "extra"], 2),
+])
+def test_main_arguments(argv, code, capsys):
+    # Test 5.3: help exits cleanly, unknown options and extra arguments exit 2 with usage
+    with patch('sys.argv', ['project.py'] + argv):
+        with pytest.raises(SystemExit) as exit_info:
+            main()
+    assert exit_info.value.code == code
+    captured = capsys.readouterr()
+    assert "Usage:" in (captured.out if code == 0 else captured.err)
+
+
+@patch('project.generate_certificate', return_value="ann_certificate.pdf")
+def test_main_reads_stdin(mock_generate, capsys):
+    # Test 5.4: '-' replays commands from stdin
+    with patch('sys.argv', ['project.py', '-', 'Ann']), patch('sys.stdin', io.StringIO("D 4\nW 1\n")):
+        main()
+    assert "Applied 2 commands, rejected 0." in capsys.readouterr().out
+    mock_generate.assert_not_called()
+
+# --- Test 6: CertificateWorker (background certificates with a bounded queue) ---
+@patch('project.generate_certificate', side_effect=lambda name, cookies: f"{name}_{cookies}.pdf")
+def test_certificate_worker(mock_generate):
+    done = []
+    worker = CertificateWorker(workers=2, on_done=lambda name, filename, error: done.append(filename))
+    for cookies in range(5):
+        worker.submit("Test", cookies)
+
+    # Test 6.1: drain() waits for every pending certificate
+    worker.drain()
+    assert sorted(done) == [f"Test_{cookies}.pdf" for cookies in range(5)]
+    assert worker.pending == 0
+
+    # Draining again is a no-op, and a drained worker takes no new jobs
+    worker.drain()
+    with pytest.raises(RuntimeError):
+        worker.submit("Test", 1)
+
+
+def test_certificate_worker_backpressure():
+    release = threading.Event()
+    with patch('project.generate_certificate', side_effect=lambda name, cookies: release.wait()):
+        worker = CertificateWorker(workers=1, max_pending=1, on_done=lambda *args: None)
+        worker.submit("A", 1)
+        worker.submit("B", 1)
+
+        # Test 6.2: one job is rendering and one is waiting, so the queue is full
+        with pytest.raises(queue.Full):
+            worker.submit("C", 1, timeout=0.05)
+
+        release.set()
+        worker.drain()
+
+
+@patch('project.generate_certificate', return_value="test_certificate.pdf")
+def test_certificate_worker_callback_error(mock_generate, capsys):
+    def failing_callback(name, filename, error):
+        raise UnicodeEncodeError("ascii", "🥳", 0, 1, "ordinal not in range(128)")
+
+    # Test 6.3: a raising callback does not kill the worker, so drain() still returns
+    worker = CertificateWorker(workers=1, max_pending=1, on_done=failing_callback)
+    for _ in range(3):
+        worker.submit("Test", 1)
+    drainer = threading.Thread(target=worker.drain, daemon=True)
+    drainer.start()
+    drainer.join(timeout=5)
+
+    assert not drainer.is_alive()
+    assert worker.pending == 0
+    assert mock_generate.call_count == 3
+    assert "callback failed" in capsys.readouterr().err
+
+
+def test_main_drains_on_eof():
+    finished = []
+
+    def slow_certificate(name, cookies):
+        time.sleep(0.1)
+        finished.append(name)
+        return "bob_certificate.pdf"
+
+    # Test 6.4: end of input at the prompt still waits for the queued certificate
+    with patch('project.generate_certificate', side_effect=slow_certificate), \
+         patch('sys.argv', ['project.py']), \
+         patch('builtins.input', side_effect=["Bob", "D", "12", EOFError]):
+        with pytest.raises(SystemExit) as exit_info:
+            main()
+
+    assert exit_info.value.code == 0
+    assert finished == ["Bob"]
@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+
+# Modules that must stay out of the startup path (they are only needed to render a certificate)
+HEAVY_MODULES = ("requests", "fpdf", "PIL", "numpy")
+
+# Generous cumulative budget for `import project`, in microseconds. Eagerly
+# importing requests and fpdf2 alone costs several times this.
+STARTUP_BUDGET_US = 50_000
+
+def import_times(module):
+    """Runs `python -X importtime -c "import <module>"` and returns {module: cumulative_us}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Skip the "self [us] | cumulative | imported package" header
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+# --- Startup benchmark: importing project stays cheap ---
+def test_import_is_lazy():
+    times = import_times("project")
+
+    # Test 1.1: the certificate dependencies are not imported at startup
+    loaded = [name for name in times if name.split(".")[0] in HEAVY_MODULES]
+    assert loaded == []
+
+    # Test 1.2: the import itself stays within the startup budget
+    assert times["project"] < STARTUP_BUDGET_US